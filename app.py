@@ -1,66 +1,105 @@
 import streamlit as st
 import pandas as pd
+import pyarrow.parquet as pq
+import re
 
 # Tags that show excerpts on record view
 EXCERPT_TAGS = ["attorneys_fees", "public_meeting_requirement", "local_preemption", "private_right_of_action"]
 TAGS_TO_SHOW_ON_RECORD_VIEW = ["attorneys_fees", "public_meeting_requirement", "local_preemption", "private_right_of_action"]
 
+# Bit order of the tag_bits column; must match TAGS in prepare_data_for_app.py
+TAGS = ["local_preemption", "private_right_of_action", "public_meeting_requirement", "attorneys_fees"]
+
+DATA_PATH = 'data/mcu_list.parquet.zst'
+
+# Columns needed for the listing page; the statute text is only read on the record page
+INDEX_COLUMNS = ['unique_id', 'full_name', 'jurisdiction', 'year', 'tag_list', 'excerpt_by_tag', 'tag_bits', 'position']
+
+# A "#" section line, the blank separator and the line that follows it. Matched after a leading newline
+# rather than with ^ and re.M, which is much slower on long statutes
+_SECTION_RE = re.compile(r'\n(#.*)\n\n(.*)')
+
 # Load data with caching
 @st.cache_data
 
-def load_data():
-    data = pd.read_parquet('data/mcu_list.parquet.gz')
+def load_index():
+    data = pd.read_parquet(DATA_PATH, columns=INDEX_COLUMNS)
+
+    # Index by unique_id so records can be looked up with .loc
+    data = data.set_index('unique_id', drop=False).sort_index()
+
+    return data
+
+
+@st.cache_data(max_entries=256)
+def load_text(record_unique_id):
+    # The parquet file is sorted by unique_id, so row group statistics let the filter skip most of the file
+    # Read straight into Arrow; a single string doesn't need a round trip through pandas
+    table = pq.read_table(DATA_PATH, columns=['text'], filters=[('unique_id', '==', record_unique_id)])
+    return table.column('text')[0].as_py()
+
+
+@st.cache_data
+def filtered_slice(selected_tag):
+    # Cached per tag, so reruns that don't change the selected tag skip the filter
+    data = load_index()
+    tag_bit = 1 << TAGS.index(selected_tag)
+    filtered_data = data[(data['tag_bits'].to_numpy() & tag_bit) != 0]
+
+    # The file is sorted by unique_id; list the statutes in code order instead
+    return filtered_data.sort_values('position')
+
 
-    tag_to_id = {}
-    id_to_idx = {}
+@st.cache_data(max_entries=256)
+def format_statute(record_unique_id):
+    # Section numbers start with "#" and the section name is on the following non-empty line,
+    # so drop empty lines and join each "#" line with the line after it
+    text = '\n\n'.join(filter(str.strip, load_text(record_unique_id).split('\n')))
+    text = _SECTION_RE.sub(r'\n\1: \2', '\n' + text)
 
-    for i, record in data.iterrows():
-        for tag in record['tag_list']:
-            tag_to_id.setdefault(tag, []).append(record['unique_id'])
-        id_to_idx[record['unique_id']] = i
-    
-    # print tags loaded
-    print(f"Tags loaded: {tag_to_id.keys()}")
+    # Demote headings one level so sections sit below the page title. Only "#" at the start
+    # of a line is touched; "#" inside the statute text is left alone
+    formatted_text = text.replace('\n#', '\n##')[1:]
 
-    return data, tag_to_id, id_to_idx
+    # Escape $ in formatted_text
+    return formatted_text.replace('$', '\\$')
 
 
-def render_listing_page(data, tag_to_id):
+def render_listing_page():
     st.title("📚 Alabama Statutes Explorer")
     st.markdown("Select a legal tag below to view related statutes.")
 
     selected_tag = st.selectbox("🔖 Filter by tag", TAGS_TO_SHOW_ON_RECORD_VIEW)
 
     if selected_tag:
-        filtered_ids = tag_to_id[selected_tag]
-        filtered_data = data[data['unique_id'].isin(filtered_ids)]
+        filtered_data = filtered_slice(selected_tag)
 
         st.markdown(f"Showing {len(filtered_data)} results for: `{selected_tag}`")
         
-        for _, record in filtered_data.iterrows():
-            unique_id = record['unique_id']
-            st.markdown(f"[{record['full_name']}](?id={unique_id})")
-
-            if selected_tag in EXCERPT_TAGS:
-                try:
-                    tag_idx = list(record['tag_list']).index(selected_tag)
-                    excerpt = record['tag_dict_list'][tag_idx].get('excerpt', '')
-                    with st.expander("Excerpt"):
-                        st.write(excerpt)
-                except (ValueError, IndexError, KeyError):
-                    pass
+        if selected_tag in EXCERPT_TAGS:
+            for _, record in filtered_data.iterrows():
+                unique_id = record['unique_id']
+                st.markdown(f"[{record['full_name']}](?id={unique_id})")
+
+                # Tags the record doesn't carry come back from parquet as None
+                excerpt = (record['excerpt_by_tag'].get(selected_tag) or {}).get('excerpt', '')
+                with st.expander("Excerpt"):
+                    st.write(excerpt)
+        else:
+            # No excerpts to interleave, so send all the links in a single markdown element
+            links = "[" + filtered_data['full_name'] + "](?id=" + filtered_data['unique_id'] + ")"
+            st.markdown("\n\n".join(links.tolist()))
 
         with st.expander("🔍 View Raw Filtered Data"):
             st.dataframe(filtered_data)
 
 
-def render_record_page(data, id_to_idx, record_unique_id):
+def render_record_page(data, record_unique_id):
     if st.button("⬅️ Back to listing", key="back_button_top"):
         st.query_params['id'] = None
 
     try:
-        record_idx = id_to_idx[record_unique_id]
-        record = data.iloc[record_idx]
+        record = data.loc[record_unique_id]
 
         st.title(record['full_name'])
 
@@ -69,27 +108,8 @@ def render_record_page(data, id_to_idx, record_unique_id):
         col1.metric("📍 Jurisdiction", record['jurisdiction'])
         col2.metric("📅 Year", record['year'])
 
-        # Process and display statute text
-        lines = [line for line in record['text'].split('\n') if line.strip()]
-        processed_lines = []
-        skip_next = False
-        
-        for i in range(len(lines)):
-            if skip_next:
-                skip_next = False
-                continue
-            if lines[i].startswith('#') and i + 1 < len(lines):
-                section = lines[i] + ": " + lines[i + 1]
-                processed_lines.append(section)
-                skip_next = True
-            else:
-                processed_lines.append(lines[i])
-
-        formatted_text = '## ' + '\n\n'.join(processed_lines).replace('#', '##')
-
-        # Escape $ in formatted_text
-        formatted_text = formatted_text.replace('$', '\\$')
-        st.markdown(formatted_text)
+        # Statute text
+        st.markdown(format_statute(record_unique_id))
 
         # Tags
         with st.expander("🏷️ Tags"):
@@ -98,18 +118,18 @@ def render_record_page(data, id_to_idx, record_unique_id):
         if st.button("⬅️ Back to listing", key="back_button_bottom"):
             st.query_params['id'] = None
 
-    except (ValueError, IndexError):
+    except (KeyError, ValueError, IndexError):
         st.error("🚫 Record not found.")
 
 
 def main():
-    data, tag_to_id, id_to_idx = load_data()
     record_unique_id = st.query_params.get("id")
 
     if not record_unique_id or record_unique_id == 'None':
-        render_listing_page(data, tag_to_id)
+        render_listing_page()
     else:
-        render_record_page(data, id_to_idx, record_unique_id)
+        data = load_index()
+        render_record_page(data, record_unique_id)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ python prepare_data_for_app.py
 
 """
 import os
-import json
+import orjson
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Any
@@ -29,15 +29,23 @@ def main():
 
     # Load minimal code units from Alabama 2023
     mcu_input_dir = "../justia-scraped/mcu_json/Alabama_2023.jsonl"
-    mcu_list = [json.loads(line.strip()) for line in open(mcu_input_dir, 'r')]
+    with open(mcu_input_dir, 'rb') as f:
+        mcu_list = [orjson.loads(line) for line in f]
 
     # Load LLM-generated tags. We produce a dictionary of tag name -> unique_id -> tag dictionary (yes/no/unknown)
     tag_input_dir = "../justia-scraped/tags"
     tag_dict = {}
     for tag in TAGS:
         tag_fpath = os.path.join(tag_input_dir, tag, f"{tag}_results.json")
-        tag_dict[tag] = json.load(open(tag_fpath, 'r'))
+        with open(tag_fpath, 'rb') as f:
+            tag_dict[tag] = orjson.loads(f.read())
         print(f"Loaded {len(tag_dict[tag])} tags for {tag}")
+
+    # Unique ids answered "yes" for each tag, so building each mcu's tag list is a set lookup per tag
+    yes_ids = {
+        tag_name: {mcu_id for mcu_id, result in results.items() if result["answer"] == "yes"}
+        for tag_name, results in tag_dict.items()
+    }
     
     # Construct the data frame for the app. This is a dataframe with the following columns:
     # - unique_id: unique id of the mcu
@@ -47,6 +55,10 @@ def main():
     # - year: year of the mcu
     # - text: text of the mcu
     # - tag_list: list of tags for the mcu
+    # - tag_dict_list: list of tag dictionaries, aligned with tag_list
+    # - excerpt_by_tag: tag name -> tag dictionary, so the app can look up an excerpt without scanning tag_list
+    # - tag_bits: bitmask of tag_list, with bit i set if TAGS[i] is in tag_list
+    # - position: position of the mcu in the source file, so the app can list mcus in code order
     # We get the tag_list from the tag_dict
     
 
@@ -63,14 +75,9 @@ def main():
         tag_list = []
         tag_dict_list = []
         for tag_name in tag_dict.keys():
-            if mcu_id in tag_dict[tag_name] and tag_dict[tag_name][mcu_id]["answer"] == "yes":
+            if mcu_id in yes_ids[tag_name]:
                 tag_list.append(tag_name)
                 tag_dict_list.append(tag_dict[tag_name][mcu_id])
-
-                # Check every value in tag_dict[tag_name][mcu_id] is a string
-                for key, value in tag_dict[tag_name][mcu_id].items():
-                    if not isinstance(value, str):
-                        print(f"Value {value} is not a string for tag {tag_name} and mcu {mcu_id}")
         
         # Construct path string 
         path_string = ""
@@ -90,15 +97,31 @@ def main():
             "year": mcu["year"],
             "text": mcu["full_text"],
             "tag_list": tag_list,
-            "tag_dict_list": tag_dict_list
+            "tag_dict_list": tag_dict_list,
+            "excerpt_by_tag": dict(zip(tag_list, tag_dict_list)),
+            "tag_bits": sum(1 << i for i, tag in enumerate(TAGS) if tag in tag_list)
         }
         new_mcu_list.append(new_mcu)
     
     
     # Save the mcu_list as a compressed parquet file
     df = pd.DataFrame(new_mcu_list)
-    df.to_parquet("data/mcu_list.parquet.gz", index=False, compression="gzip")
-    print(f"Saved {len(new_mcu_list)} MCUs to data/mcu_list.parquet.gz")
+    df["tag_bits"] = df["tag_bits"].astype("uint8")
+    df["position"] = df.index.astype("int32")
+    # Low-cardinality string columns are stored dictionary-encoded and read back as categoricals
+    for column in ["jurisdiction", "path", "year"]:
+        df[column] = df[column].astype("category")
+    # Rows are sorted by unique_id and split into small row groups, so the app can read a single
+    # record with a unique_id filter and skip every other row group using its min/max statistics
+    df.sort_values("unique_id").to_parquet(
+        "data/mcu_list.parquet.zst",
+        index=False,
+        compression="zstd",
+        compression_level=3,
+        row_group_size=128,
+        use_dictionary=["jurisdiction", "path", "year"],
+    )
+    print(f"Saved {len(new_mcu_list)} MCUs to data/mcu_list.parquet.zst")
     
 
 if __name__ == "__main__":
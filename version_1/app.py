@@ -6,29 +6,32 @@ import pandas as pd
 @st.cache_data
 def load_data():
     # Load the data
-    data = pd.read_parquet('data/mcu_list.parquet.gz') 
+    data = pd.read_parquet('data/mcu_list.parquet.zst') 
     
-    # Construct a mapping from effect to list of (unique id, explanation) tuples.
-    # Also construct a mapping from unique id to dataframe row idx
-    effect_to_id = {}
-    id_to_idx = {}
-    for i in range(len(data)):
-        record = data.iloc[i]
-        for effect in record['legal_effects']:
-            if effect['effect'] not in effect_to_id:
-                effect_to_id[effect['effect']] = []
-            effect_to_id[effect['effect']].append((record['unique_id'], effect['explanation']))
-            id_to_idx[record['unique_id']] = i
+    # Construct mappings from effect to the unique ids and explanations tagged with it, as parallel arrays.
+    # Explode to one row per (record, effect) and let groupby collect the row positions of each effect.
+    effects = data[['unique_id', 'legal_effects']].explode('legal_effects').dropna()
+    effect_names = effects['legal_effects'].str['effect']
+    unique_ids = effects['unique_id'].to_numpy()
+    explanations = effects['legal_effects'].str['explanation'].to_numpy()
+    effect_positions = effect_names.groupby(effect_names, sort=False).indices
+    effect_to_ids = {effect: unique_ids[idx] for effect, idx in effect_positions.items()}
+    effect_to_expl = {effect: explanations[idx] for effect, idx in effect_positions.items()}
+
+    # Index by unique id so records can be looked up with .loc. Some unique ids appear on more
+    # than one row, so keep the last one, as the old id_to_idx mapping did
+    data = data.drop_duplicates('unique_id', keep='last')
+    data = data.set_index('unique_id', drop=False).sort_index()
     
     
     # Construct a list of unique effects
-    unique_effects = list(effect_to_id.keys())
+    unique_effects = list(effect_to_ids.keys())
     unique_effects.sort()
-    return data, effect_to_id, unique_effects, id_to_idx
+    return data, effect_to_ids, effect_to_expl, unique_effects
 
 def main():
     # Get the data
-    data, effect_to_id, unique_effects, id_to_idx = load_data()
+    data, effect_to_ids, effect_to_expl, unique_effects = load_data()
     
     # Get query parameters
     query_params = st.query_params
@@ -43,8 +46,8 @@ def main():
         
         if selected_effect:
             # Filter data based on selected effect
-            filtered_ids, filtered_explanations = zip(*effect_to_id[selected_effect])
-            filtered_data = data[data['unique_id'].isin(filtered_ids)]
+            filtered_data = data.loc[effect_to_ids[selected_effect]]
+            filtered_explanations = effect_to_expl[selected_effect]
             
             # Display the list of records with links
             st.write(f"Showing {len(filtered_data)} records for effect: {selected_effect}")
@@ -59,8 +62,7 @@ def main():
     else:
         # This is an individual record page
         try:
-            record_idx = id_to_idx[record_unique_id]
-            record = data.iloc[record_idx]
+            record = data.loc[record_unique_id]
             
             # Display the record
             st.title(f"{record['full_name']}")
@@ -96,7 +98,7 @@ def main():
                 
             # Add a back button
             st.markdown("[Back to listing](?)")
-        except (ValueError, IndexError):
+        except (KeyError, ValueError, IndexError):
             st.error("Record not found")
 
 if __name__ == "__main__":
@@ -7,9 +7,14 @@ and reports any abnormalities found.
 """
 
 import json
+import multiprocessing as mp
 import sys
 import re
 
+# Compiled once at import time; validate_statute_structure runs once per statute
+_MAIN_TITLE_RE = re.compile(r'# .+')
+_SECTION_RE = re.compile(r'## .+')
+
 def validate_statute_structure(statute, index):
     """Validate the structure of a single statute entry."""
     errors = []
@@ -52,15 +57,15 @@ def validate_statute_structure(statute, index):
             errors.append(f"  - 'content' field is not a string")
         else:
             # Check if content has proper Markdown headers
-            if not re.search(r'# .+', content):
+            if not _MAIN_TITLE_RE.search(content):
                 errors.append(f"  - 'content' does not have a main title (# heading)")
             
             # Check if content has sections
-            if not re.search(r'## .+', content):
+            if not _SECTION_RE.search(content):
                 errors.append(f"  - 'content' does not have any sections (## headings)")
             
             # Check for citations
-            if not re.search(r'Citation:', content):
+            if 'Citation:' not in content:
                 errors.append(f"  - 'content' appears to be missing citations")
     
     # Check for nested tags
@@ -77,6 +82,11 @@ def validate_statute_structure(statute, index):
     
     return errors
 
+def _validate_indexed(item):
+    """Validate an (index, statute) pair and return (index, errors), for use as a Pool worker."""
+    i, statute = item
+    return i, validate_statute_structure(statute, i)
+
 def main():
     """Main validation function."""
     if len(sys.argv) > 1:
@@ -103,10 +113,14 @@ def main():
     
     print(f"Found {len(data)} statute entries.")
     
-    # Validate each statute
+    # Validate each statute. Statutes are independent, so spread them over a process pool
+    # and collect the results by index to report them in file order
+    with mp.Pool() as pool:
+        results = dict(pool.imap_unordered(_validate_indexed, enumerate(data), chunksize=256))
+
     total_errors = 0
     for i, statute in enumerate(data):
-        errors = validate_statute_structure(statute, i)
+        errors = results[i]
         if errors:
             print(f"Issues found in statute {i} ('{statute.get('title', 'Untitled')}'):")
             for error in errors:
@@ -149,7 +149,7 @@ def main():
     
     # Save the mcu_list as a compressed parquet file
     df = pd.DataFrame(new_mcu_list)
-    df.to_parquet("data/mcu_list.parquet.gz", index=False, compression="gzip")
+    df.to_parquet("data/mcu_list.parquet.zst", index=False, compression="zstd", compression_level=3)
     
 
 if __name__ == "__main__":